@@ -13,9 +13,16 @@ CLIENT_TIMEOUT_TOTAL = 300    # 5 minutes total timeout
 CLIENT_TIMEOUT_CONNECT = 30   # 30 seconds connection timeout
 
 # Connection Pool Configuration
-CONNECTOR_LIMIT = 100         # Total connection pool size
-CONNECTOR_LIMIT_PER_HOST = 30 # Connections per host
-CONNECTOR_KEEPALIVE_TIMEOUT = 30  # Keep-alive timeout
+# The proxy only talks to api.openai.com, so no per-host cap is applied
+CONNECTOR_LIMIT = 1000        # Total connection pool size
+CONNECTOR_LIMIT_PER_HOST = 0  # Connections per host (0 = unlimited)
+CONNECTOR_KEEPALIVE_TIMEOUT = 75  # Keep-alive timeout (OpenAI holds ~90s)
+# Note: enable_cleanup_closed is intentionally off. It works around an
+# old OpenSSL transport leak by sweeping closed SSL transports on a
+# recurring loop task, which costs CPU on every iteration. If leaks
+# appear on your Python build, lower the keepalive timeout instead so
+# the connector reaps idle connections sooner.
+CONNECTOR_DNS_CACHE_TTL = 300     # Seconds to cache upstream DNS lookups
 
 # CORS Configuration
 CORS_ALLOW_ORIGIN = "*"
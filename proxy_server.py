@@ -8,41 +8,177 @@ preserving headers, method, and body content.
 
 Usage:
     python proxy_server.py [--port PORT] [--host HOST] [--client CLIENT_IP]
+                           [--workers N]
 
 Environment Variables:
     PROXY_PORT: Port to run the proxy server on (default: 8080)
     PROXY_HOST: Host to bind the server to (default: 0.0.0.0)
+    PROXY_WORKERS: Number of worker processes (default: 1)
 """
 
 import asyncio
-import gzip
 import aiohttp
 import argparse
+import hashlib
+import ipaddress
 import logging
 import os
+import queue
+import signal
+import socket
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from aiohttp import web, ClientSession
+from multidict import CIMultiDict
 from typing import Optional
+from yarl import URL
+
+try:
+    # Optional: uvloop is a drop-in, C-implemented event loop that
+    # roughly doubles aiohttp throughput. Fall back to the stock
+    # asyncio loop when it isn't installed (e.g. on Windows).
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    uvloop = None
+
+try:
+    # Optional: httpx enables HTTP/2 to api.openai.com, multiplexing
+    # all upstream calls over a handful of TLS connections instead of
+    # one TCP+TLS connection per in-flight request. When it isn't
+    # installed the proxy falls back to the aiohttp HTTP/1.1 client.
+    import httpx
+
+    # httpx only negotiates HTTP/2 when the h2 package (the [http2]
+    # extra) is present; probe it here so a plain httpx install falls
+    # back to aiohttp instead of AsyncClient(http2=True) raising at
+    # startup
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+try:
+    # Optional: short-TTL response caching for idempotent GETs
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
 
 logger = logging.getLogger(__name__)
 
 # OpenAI API base URL
 OPENAI_API_BASE = "https://api.openai.com"
 
+# Hop-by-hop headers that must not be forwarded in either direction
+# (RFC 7230 section 6.1), built once instead of per request
+_HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+    }
+)
+
+# CORS headers added to every proxied response
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "http://localhost:3000",
+    "Access-Control-Allow-Credentials": "true",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "authorization, content-type",
+}
+
+# Preflight responses additionally advertise a cache lifetime
+_CORS_PREFLIGHT_HEADERS = {
+    **_CORS_HEADERS,
+    "Access-Control-Max-Age": "86400",
+}
+
+def _force_tcp_nodelay(transport) -> None:
+    """
+    Disable Nagle's algorithm on the client socket so each forwarded
+    chunk (e.g. an SSE token) is flushed immediately instead of waiting
+    up to an ACK interval. Recent asyncio loops set this on new TCP
+    transports, but force it so behavior doesn't depend on the loop
+    implementation.
+    """
+    sock = transport.get_extra_info("socket") if transport else None
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
+
+# Upstream failures that should surface as a 502, whichever client is
+# in use
+if httpx is not None:
+    _UPSTREAM_ERRORS = (aiohttp.ClientError, httpx.HTTPError)
+else:
+    _UPSTREAM_ERRORS = (aiohttp.ClientError,)
+
 
 class OpenAIProxy:
     def __init__(self, allowed_client_ip: Optional[str] = None):
         self.session: Optional[ClientSession] = None
+        self.http2_client: Optional["httpx.AsyncClient"] = None
         self.allowed_client_ip = allowed_client_ip
+        # Parse the allowlist once at startup; a bare IP becomes a /32
+        # (or /128) network, and CIDR notation works as well
+        self._allowed_networks = None
+        if allowed_client_ip:
+            self._allowed_networks = [
+                ipaddress.ip_network(ip.strip(), strict=False)
+                for ip in allowed_client_ip.split(",")
+            ]
+        # Parse the constant base URL once, marked pre-encoded so yarl
+        # skips percent-encoding normalization; per-request URLs are
+        # built by joining the (already parsed and encoded) relative URL
+        # onto it, so no URL string is ever re-parsed per request
+        self._base_url = URL(OPENAI_API_BASE, encoded=True)
+        # Short-lived cache for idempotent GETs (the model list changes
+        # rarely but is polled often). Entries are keyed by path and a
+        # salted hash of the Authorization header so one client's cached
+        # data is never served to another.
+        self._cache = TTLCache(maxsize=256, ttl=60) if TTLCache else None
+        self._cache_salt = os.urandom(16)
+        # Preflight responses are constant, so case-fold the header names
+        # once here; aiohttp Response objects are single-use, but copying
+        # from a CIMultiDict is a straight clone
+        self._preflight_headers = CIMultiDict(_CORS_PREFLIGHT_HEADERS)
 
     async def create_session(self):
-        """Create aiohttp client session with proper configuration"""
+        """Create the upstream client with proper configuration"""
+        if httpx is not None:
+            # Prefer HTTP/2 upstream: ALPN-negotiated multiplexing means
+            # concurrent requests (including interleaved SSE streams)
+            # share connections instead of each paying a TLS handshake
+            self.http2_client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(300, connect=30),
+                limits=httpx.Limits(
+                    max_connections=1000, max_keepalive_connections=100
+                ),
+                headers={"User-Agent": "OpenAI-Proxy/1.0"},
+            )
+            return
+
         timeout = aiohttp.ClientTimeout(total=300, connect=30)
+        # The proxy talks to exactly one upstream host, so a per-host cap
+        # would just queue excess clients on the connector. Size the pool
+        # generously, keep connections alive long enough to match
+        # OpenAI's ~90s server-side keepalive, and cache DNS lookups.
         connector = aiohttp.TCPConnector(
-            limit=100,
-            limit_per_host=30,
-            keepalive_timeout=30,
-            enable_cleanup_closed=True,
+            limit=1000,
+            limit_per_host=0,
+            keepalive_timeout=75,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
         )
         self.session = ClientSession(
             timeout=timeout,
@@ -52,7 +188,9 @@ class OpenAIProxy:
         )
 
     async def close_session(self):
-        """Clean up the client session"""
+        """Clean up the upstream client"""
+        if self.http2_client:
+            await self.http2_client.aclose()
         if self.session:
             await self.session.close()
 
@@ -61,156 +199,311 @@ class OpenAIProxy:
         # Check for X-Forwarded-For header (for reverse proxies)
         forwarded_for = request.headers.get('X-Forwarded-For')
         if forwarded_for:
-            # Take the first IP in the chain
-            return forwarded_for.split(',')[0].strip()
-        
+            # Take the first IP in the chain without splitting the rest
+            comma = forwarded_for.find(',')
+            if comma >= 0:
+                forwarded_for = forwarded_for[:comma]
+            return forwarded_for.strip()
+
         # Check for X-Real-IP header (for nginx)
         real_ip = request.headers.get('X-Real-IP')
         if real_ip:
             return real_ip.strip()
-        
+
         # Fall back to remote address
         return request.remote
 
-    async def proxy_request(self, request: web.Request) -> web.Response:
+    def _ip_allowed(self, client_ip: str) -> bool:
+        """Check a client IP against the precompiled allowlist"""
+        try:
+            addr = ipaddress.ip_address(client_ip)
+        except ValueError:
+            # Unparseable spoofed header: treat as not allowed
+            return False
+        return any(addr in network for network in self._allowed_networks)
+
+    async def proxy_request(self, request: web.Request) -> web.StreamResponse:
         """
-        Proxy the incoming request to OpenAI API
+        Proxy the incoming request to OpenAI API, streaming the response
+        body back to the client as it arrives from upstream
         """
         # Check client IP if restriction is enabled
-        if self.allowed_client_ip:
+        if self._allowed_networks is not None:
             client_ip = self._get_client_ip(request)
-            if client_ip != self.allowed_client_ip:
-                logger.warning(f"Access denied for client IP: {client_ip} (allowed: {self.allowed_client_ip})")
+            if not self._ip_allowed(client_ip):
+                logger.warning(
+                    "Access denied for client IP: %s (allowed: %s)",
+                    client_ip,
+                    self.allowed_client_ip,
+                )
                 return web.Response(
                     text="Access denied: Client IP not allowed",
                     status=403,
                     headers={"Access-Control-Allow-Origin": "*"},
                 )
 
+        resp = None
         try:
-            # Construct the target URL
-            path = request.path_qs
-            target_url = f"{OPENAI_API_BASE}{path}"
-
-            # Prepare headers (exclude hop-by-hop headers)
-            headers = dict(request.headers)
-
-            # Remove hop-by-hop headers that shouldn't be forwarded
-            hop_by_hop_headers = {
-                "connection",
-                "keep-alive",
-                "proxy-authenticate",
-                "proxy-authorization",
-                "te",
-                "trailers",
-                "transfer-encoding",
-                "upgrade",
-                "host",
-            }
-            headers = {
-                k: v for k, v in headers.items() if k.lower() not in hop_by_hop_headers
-            }
-
-            # Read request body
-            body = None
-            if request.can_read_body:
-                body = await request.read()
-
-            logger.info(f"Proxying {request.method} {target_url}")
-            logger.debug(f"Headers: {dict(headers)}")
-            logger.debug(f"Body: {body[:100] if body else 'No body'}")
+            # Serve frequently polled, idempotent GETs from the cache
+            cache_key = None
+            if (
+                self._cache is not None
+                and request.method == "GET"
+                and (
+                    request.path == "/v1/models"
+                    or request.path.startswith("/v1/models/")
+                )
+            ):
+                cache_key = self._make_cache_key(request)
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    status, body, cached_headers = cached
+                    logger.info(
+                        "%s %s -> %d (cached)", request.method, request.path_qs, status
+                    )
+                    return web.Response(
+                        body=body, status=status, headers=cached_headers
+                    )
+
+            # Construct the target URL as a yarl.URL so aiohttp skips its
+            # string-parse/canonicalization branch
+            target_url = self._base_url.join(request.rel_url)
+
+            # Prepare headers: copy into a case-insensitive multidict and
+            # drop hop-by-hop headers in place, avoiding a per-key lower()
+            headers = CIMultiDict(request.headers)
+            for name in _HOP_BY_HOP:
+                headers.popall(name, None)
+
+            # Forward the request body as a stream instead of buffering
+            # it: iter_any() hands over each chunk exactly as it arrives
+            # from the client, so the upstream writer never joins chunks
+            # into an intermediate buffer. The Content-Length header
+            # (when present) is forwarded above, so upstream still sees
+            # fixed framing for non-chunked uploads.
+            data = request.content.iter_any() if request.can_read_body else None
+
+            # %-style args defer all formatting (CIMultiDict repr
+            # included) until a handler actually emits the record
+            logger.debug("Headers: %s", headers)
+
+            # Cache misses need the full body in memory, so they take a
+            # buffered path instead of the streaming one
+            if cache_key is not None:
+                return await self._fetch_cacheable(
+                    request, target_url, headers, cache_key
+                )
+
+            # Use the multiplexed HTTP/2 client when available
+            if self.http2_client is not None:
+                return await self._proxy_http2(request, target_url, headers, data)
 
             # Make the request to OpenAI
             async with self.session.request(
                 method=request.method,
                 url=target_url,
                 headers=headers,
-                data=body,
+                data=data,
                 allow_redirects=False,
             ) as response:
 
-                # Prepare response headers
-                resp_headers = dict(response.headers)
-
-                # Remove hop-by-hop headers from response
-                resp_headers = {
-                    k: v
-                    for k, v in resp_headers.items()
-                    if k.lower() not in hop_by_hop_headers
-                }
-
-                # Add CORS headers for browser compatibility
-                resp_headers["Access-Control-Allow-Origin"] = "http://localhost:3000"
-                resp_headers["Access-Control-Allow-Credentials"] = "true"
-                resp_headers["Access-Control-Allow-Methods"] = (
-                    "GET, POST, PUT, DELETE, OPTIONS"
+                # Prepare response headers: mutate a CIMultiDict copy in
+                # place (drop hop-by-hop, add CORS) instead of rebuilding
+                # a dict with a per-key lower()
+                resp_headers = CIMultiDict(response.headers)
+                for name in _HOP_BY_HOP:
+                    resp_headers.popall(name, None)
+                resp_headers.update(_CORS_HEADERS)
+
+                logger.debug("Response Status: %d", response.status)
+                logger.debug("Response Headers: %s", resp_headers)
+
+                # Stream the response body back to the client chunk by
+                # chunk instead of buffering it, so SSE streams and large
+                # completions are forwarded as they arrive
+                resp = web.StreamResponse(
+                    status=response.status, headers=resp_headers
                 )
-                resp_headers["Access-Control-Allow-Headers"] = "authorization, content-type"
-
-                # Read response body
-                response_body = await response.read()
-
+                await resp.prepare(request)
+                _force_tcp_nodelay(request.transport)
+                async for chunk in response.content.iter_any():
+                    await resp.write(chunk)
+                await resp.write_eof()
+
+                # One log line per request, emitted once the response is
+                # fully forwarded
                 logger.info(
-                    f"Response: {response.status} for {request.method} {target_url}"
-                )
-
-                logger.debug(f"Response Status: {response.status}")
-                logger.debug(f"Response Headers: {resp_headers}")
-                # unzip the response body if it is compressed
-                if response.headers.get("Content-Encoding") == "gzip":
-                    unzipped_response_body = gzip.decompress(response_body)
-                    logger.debug(
-                        f"Response Body: {unzipped_response_body if unzipped_response_body else 'No body'}"
-                    )
-
-                # Create and return the response
-                return web.Response(
-                    body=response_body, status=response.status, headers=resp_headers
+                    "%s %s -> %d", request.method, target_url, response.status
                 )
+                return resp
 
-        except aiohttp.ClientError as e:
-            logger.error(f"Client error proxying request: {e}")
+        except _UPSTREAM_ERRORS as e:
+            logger.error("Client error proxying request: %s", e)
+            if resp is not None and resp.prepared:
+                # Headers already went out; we can't send an error response
+                raise
             return web.Response(
                 text=f"Proxy error: {str(e)}",
                 status=502,
                 headers={"Access-Control-Allow-Origin": "*"},
             )
         except Exception as e:
-            logger.error(f"Unexpected error proxying request: {e}")
+            logger.error("Unexpected error proxying request: %s", e)
+            if resp is not None and resp.prepared:
+                raise
             return web.Response(
                 text=f"Internal proxy error: {str(e)}",
                 status=500,
                 headers={"Access-Control-Allow-Origin": "*"},
             )
 
+    def _make_cache_key(self, request: web.Request) -> tuple:
+        """Build a cache key that never mixes data between API keys or
+        content encodings"""
+        auth = request.headers.get("Authorization", "")
+        auth_digest = hashlib.sha256(
+            self._cache_salt + auth.encode("utf-8", "surrogateescape")
+        ).digest()
+        # The aiohttp fetch stores the upstream body verbatim, encoding
+        # included, so partition by Accept-Encoding as well: upstream
+        # sends Vary: Accept-Encoding, and a gzip body cached for one
+        # client must not be replayed to one that asked for identity
+        accept_encoding = request.headers.get("Accept-Encoding", "")
+        return (request.path_qs, accept_encoding, auth_digest)
+
+    async def _fetch_cacheable(
+        self,
+        request: web.Request,
+        target_url: URL,
+        headers: CIMultiDict,
+        cache_key: tuple,
+    ) -> web.Response:
+        """
+        Fetch a cacheable GET with full buffering and store the result
+        for subsequent identical requests
+        """
+        if self.http2_client is not None:
+            upstream_request = self.http2_client.build_request(
+                "GET", str(target_url), headers=list(headers.items())
+            )
+            upstream = await self.http2_client.send(
+                upstream_request, follow_redirects=False
+            )
+            status = upstream.status_code
+            body = upstream.content
+            resp_headers = CIMultiDict(upstream.headers.multi_items())
+            # httpx already decompressed the body, so the upstream
+            # framing headers no longer describe it
+            resp_headers.popall("content-encoding", None)
+        else:
+            async with self.session.request(
+                method="GET",
+                url=target_url,
+                headers=headers,
+                allow_redirects=False,
+            ) as response:
+                status = response.status
+                body = await response.read()
+                resp_headers = CIMultiDict(response.headers)
+
+        for name in _HOP_BY_HOP:
+            resp_headers.popall(name, None)
+        # web.Response computes Content-Length from the body it is given
+        resp_headers.popall("Content-Length", None)
+        resp_headers.update(_CORS_HEADERS)
+
+        if status == 200 and "no-store" not in resp_headers.get(
+            "Cache-Control", ""
+        ):
+            self._cache[cache_key] = (status, body, resp_headers)
+
+        logger.info("%s %s -> %d", request.method, target_url, status)
+        return web.Response(body=body, status=status, headers=resp_headers)
+
+    async def _proxy_http2(
+        self,
+        request: web.Request,
+        target_url: URL,
+        headers: CIMultiDict,
+        data,
+    ) -> web.StreamResponse:
+        """
+        Forward the request over the HTTP/2 upstream client, streaming
+        both the request and response bodies
+        """
+        resp = None
+        try:
+            upstream_request = self.http2_client.build_request(
+                request.method,
+                str(target_url),
+                headers=list(headers.items()),
+                content=data,
+            )
+            upstream = await self.http2_client.send(
+                upstream_request, stream=True, follow_redirects=False
+            )
+            try:
+                # httpx canonicalizes header names to lowercase;
+                # multi_items() preserves repeated headers like Set-Cookie
+                resp_headers = CIMultiDict(upstream.headers.multi_items())
+                for name in _HOP_BY_HOP:
+                    resp_headers.popall(name, None)
+                resp_headers.update(_CORS_HEADERS)
+
+                resp = web.StreamResponse(
+                    status=upstream.status_code, headers=resp_headers
+                )
+                await resp.prepare(request)
+                _force_tcp_nodelay(request.transport)
+                # aiter_raw() yields the wire bytes without decoding, so
+                # the forwarded Content-Encoding header stays accurate
+                async for chunk in upstream.aiter_raw():
+                    await resp.write(chunk)
+                await resp.write_eof()
+
+                logger.info(
+                    "%s %s -> %d",
+                    request.method,
+                    target_url,
+                    upstream.status_code,
+                )
+                return resp
+            finally:
+                await upstream.aclose()
+
+        except httpx.HTTPError as e:
+            logger.error("Client error proxying request: %s", e)
+            if resp is not None and resp.prepared:
+                raise
+            return web.Response(
+                text=f"Proxy error: {str(e)}",
+                status=502,
+                headers={"Access-Control-Allow-Origin": "*"},
+            )
+
     async def handle_options(self, request: web.Request) -> web.Response:
         """Handle CORS preflight requests"""
         # Check client IP if restriction is enabled
-        if self.allowed_client_ip:
+        if self._allowed_networks is not None:
             client_ip = self._get_client_ip(request)
-            if client_ip != self.allowed_client_ip:
-                logger.warning(f"Access denied for CORS preflight from client IP: {client_ip} (allowed: {self.allowed_client_ip})")
+            if not self._ip_allowed(client_ip):
+                logger.warning(
+                    "Access denied for CORS preflight from client IP: %s (allowed: %s)",
+                    client_ip,
+                    self.allowed_client_ip,
+                )
                 return web.Response(
                     text="Access denied: Client IP not allowed",
                     status=403,
                     headers={"Access-Control-Allow-Origin": "*"},
                 )
 
-        return web.Response(
-            headers={
-                "Access-Control-Allow-Origin": "http://localhost:3000",
-                "Access-Control-Allow-Credentials": "true",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-                "Access-Control-Allow-Headers": "authorization, content-type",
-                "Access-Control-Max-Age": "86400",
-            }
-        )
+        return web.Response(headers=self._preflight_headers)
 
 
 async def create_app(allowed_client_ip: Optional[str] = None) -> web.Application:
     """Create and configure the web application"""
     proxy = OpenAIProxy(allowed_client_ip)
-    await proxy.create_session()
 
     app = web.Application()
 
@@ -218,17 +511,22 @@ async def create_app(allowed_client_ip: Optional[str] = None) -> web.Application
     app.router.add_route("OPTIONS", "/{path:.*}", proxy.handle_options)
     app.router.add_route("*", "/{path:.*}", proxy.proxy_request)
 
-    # Cleanup function
+    # Create the upstream session when the server starts and tear it
+    # down on cleanup
+    async def startup_session(app):
+        await proxy.create_session()
+
     async def cleanup_session(app):
         await proxy.close_session()
 
+    app.on_startup.append(startup_session)
     app.on_cleanup.append(cleanup_session)
 
     return app
 
 
-async def main():
-    """Main application entry point"""
+def parse_args():
+    """Parse command-line arguments"""
     parser = argparse.ArgumentParser(description="OpenAI API Proxy Server")
     parser.add_argument(
         "--port",
@@ -252,23 +550,40 @@ async def main():
     parser.add_argument(
         "--client",
         type=str,
-        help="Only allow connections from this specific client IP address",
+        help="Only allow connections from these client IPs "
+        "(comma-separated; CIDR networks are accepted)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("PROXY_WORKERS", 1)),
+        help="Number of worker processes sharing the port via "
+        "SO_REUSEPORT (default: 1; >1 requires Linux)",
+    )
+
+    return parser.parse_args()
 
-    args = parser.parse_args()
 
+async def serve(args):
+    """Run one proxy worker: its own event loop and upstream session"""
     # Configure logging based on command-line argument
     numeric_level = getattr(logging, args.log_level.upper(), None)
     if not isinstance(numeric_level, int):
         raise ValueError(f"Invalid log level: {args.log_level}")
 
+    # Route log records through a queue drained by a background thread,
+    # so console/disk writes never block the event loop
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(
+        log_queue,
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler("proxy.log"),
+    )
+    log_listener.start()
     logging.basicConfig(
         level=numeric_level,
         format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("proxy.log"),
-        ],
+        handlers=[QueueHandler(log_queue)],
     )
 
     app = await create_app(args.client)
@@ -281,18 +596,34 @@ async def main():
         logger.info("Allowing connections from all client IPs")
 
     try:
-        # Run the server
-        runner = web.AppRunner(app)
+        # Run the server; skip aiohttp's Apache-style access logger
+        # since proxy_request already emits one line per request
+        runner = web.AppRunner(app, access_log=None)
         await runner.setup()
-        site = web.TCPSite(runner, args.host, args.port)
+        site = web.TCPSite(
+            runner,
+            args.host,
+            args.port,
+            reuse_port=True if args.workers > 1 else None,
+        )
         await site.start()
 
         logger.info("Proxy server started successfully")
         logger.info("Press Ctrl+C to stop the server")
 
-        # Keep the server running
-        while True:
-            await asyncio.sleep(3600)
+        # Park until SIGINT/SIGTERM; no periodic wakeups. Cleanup in the
+        # finally block then drains in-flight requests gracefully.
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                # Signal handlers aren't available on this platform
+                # (e.g. Windows); fall back to KeyboardInterrupt
+                pass
+        await stop.wait()
+        logger.info("Received termination signal, shutting down...")
 
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
@@ -300,11 +631,41 @@ async def main():
         logger.error(f"Server error: {e}")
     finally:
         await runner.cleanup()
+        log_listener.stop()
+
+
+def main():
+    """Main application entry point"""
+    args = parse_args()
+
+    # Fork additional workers before any event loop or thread exists;
+    # each process runs its own loop and upstream session (client
+    # sessions are not fork-safe) and the kernel load-balances accepted
+    # connections across the SO_REUSEPORT listening sockets.
+    child_pids = []
+    if args.workers > 1:
+        for _ in range(args.workers - 1):
+            pid = os.fork()
+            if pid == 0:
+                child_pids = []
+                break
+            child_pids.append(pid)
+
+    try:
+        asyncio.run(serve(args))
+    finally:
+        # The parent tears down its children on the way out
+        for pid in child_pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
         print("\nServer stopped by user")
     except Exception as e: